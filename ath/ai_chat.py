@@ -1,19 +1,214 @@
 import os
-import requests
+import re
+import json
+import math
+import heapq
+import threading
+import textwrap
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any
 from rich.console import Console
 from .manager import load_config, get_api_key, set_config_value
+from .llm_cache import ResponseCache
+from .storage import LocalStorage
+from .embeddings import EmbeddingDB
 
 console = Console()
 
+# orjson decodes the per-token NDJSON lines from Ollama several times faster
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# Responses above this temperature vary too much between calls to be worth caching
+CACHE_MAX_TEMPERATURE = 0.3
+
+# Chat turns of the current session kept in memory
+HISTORY_TURNS = 20
+
+# Questions sent to the provider at once by ask_batch
+BATCH_CONCURRENCY = 10
+
+# Characters of the project overview included in every system prompt
+PROJECT_CONTEXT_CHARS = 1000
+
+PROMPT_GUIDELINES = [
+    "- Refer to files, functions and classes by name",
+    "- Say so when the provided code does not answer the question",
+]
+CONCISE_GUIDELINE = "- Respond in 150 words or fewer unless the user asks for detail"
+
+# Short questions without code go to a small quantized model on Ollama
+DEFAULT_FAST_MODEL = "qwen2.5-coder:1.5b"
+SIMPLE_QUESTION_WORDS = 8
+
+# Output token limits; generation time grows with every token produced
+DEFAULT_MAX_TOKENS = 300
+VERBOSE_MAX_TOKENS = 1000
+
+
+# Approximate token budget for the per-question code sections
+CODE_SECTIONS_TOKEN_BUDGET = 2000
+DOCSTRING_CHARS = 120
+CHUNK_LABELS = {"function": "fn", "class": "class", "module": "module"}
+
+# Keyword retrieval weights for matches in a chunk's name, docstring and path
+NAME_WEIGHT = 5
+DOC_WEIGHT = 3
+PATH_WEIGHT = 2
+
+# BM25 term-frequency saturation and length normalization
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+
+# Lookups answered straight from storage without calling a provider
+WHERE_IS_RE = re.compile(r"^where is (?:the )?(?:function |class |method )?`?(\w+)`?(?: defined)?\??$", re.I)
+LIST_IN_RE = re.compile(r"^list (?:all )?(?:the )?(functions|classes) in `?([\w./\\-]+?)`?\??$", re.I)
+WHAT_DOES_RE = re.compile(r"^what does `?(\w+)`?(?:\(\))? do\??$", re.I)
+
+
+class ProviderError(Exception):
+    """Raised when a provider cannot produce a response"""
+
+
+_token_encoder = None
+
+
+def _count_tokens(text: str) -> int:
+    """Count tokens with tiktoken when installed, otherwise estimate ~4 chars per token"""
+    global _token_encoder
+    if _token_encoder is None:
+        try:
+            import tiktoken
+            _token_encoder = tiktoken.get_encoding("cl100k_base").encode
+        except ImportError:
+            _token_encoder = False
+    if _token_encoder:
+        return len(_token_encoder(text))
+    return len(text) // 4 + 1
+
+
+def _compress_section(chunk: Dict[str, Any]) -> str:
+    """Render a chunk for the prompt using as few tokens as possible"""
+    label = CHUNK_LABELS.get(chunk["chunk_type"], chunk["chunk_type"])
+    lines = [f"{label} {chunk['name']} ({chunk['file_path']}:{chunk['line_start']}-{chunk['line_end']})"]
+    if chunk["docstring"]:
+        first_sentence = chunk["docstring"].strip().split(". ")[0]
+        lines.append("doc: " + textwrap.shorten(first_sentence, DOCSTRING_CHARS, placeholder="..."))
+    code = textwrap.dedent(chunk["content"][:1000])
+    code = "\n".join(line.rstrip() for line in code.splitlines() if line.strip())
+    lines.append(code)
+    return "\n".join(lines)
+
+
+def _tokenize(text: str) -> list:
+    """Lowercase word tokens, splitting snake_case and paths"""
+    return re.findall(r"[a-z0-9]+", text.lower())
+
 
 class ChatAI:
     """Interactive AI chat assistant using config-managed providers"""
 
-    def __init__(self):
+    def __init__(self, aibuddy_dir=None, verbose: bool = False):
         self.config = load_config()
         self.provider = self.config.get("provider", "ollama")
         self.model = self.config.get("model", "codellama:7b")
-        self.conversation_history = []
+        self.fast_model = self.config.get("fast_model", DEFAULT_FAST_MODEL)
+        if str(self.fast_model).lower() == "none":
+            self.fast_model = None  # Routing turned off with 'ath config set fast_model none'
+        self.temperature = float(self.config.get("temperature", 0.2))
+        self.verbose = verbose
+        self.max_tokens = int(self.config.get("max_tokens", DEFAULT_MAX_TOKENS))
+        if verbose:
+            # Verbose raises the limit; it never cuts a larger configured one
+            self.max_tokens = max(VERBOSE_MAX_TOKENS, self.max_tokens)
+        self.aibuddy_dir = aibuddy_dir
+        self.cache = ResponseCache(aibuddy_dir) if aibuddy_dir else None
+        self.storage = LocalStorage(aibuddy_dir) if aibuddy_dir else None
+        self.conversation_history = deque(maxlen=HISTORY_TURNS)
+        self.embeddings = EmbeddingDB(aibuddy_dir) if aibuddy_dir else None
+        self._chunks_soa = None
+        self._chunks_version = None
+        self._postings = {}
+        self._length_norms = []
+        self._static_prompt_prefix = None
+        self._init_lock = threading.Lock()
+        self._stats = {"questions": 0, "direct_hits": 0}
+
+        self._http = None
+        self._openai_client = None
+        self._anthropic_client = None
+
+    def initialize(self):
+        """Load stored chunks and build the keyword index once"""
+        self._chunks_version = self.storage.version() if self.storage else None
+        # Metadata columns only; content is fetched for the few chunks that reach a prompt
+        self._chunks_soa = self.storage.get_chunk_columns() if self.storage else {
+            "id": (), "file_path": (), "chunk_type": (), "name": (), "docstring": ()
+        }
+        if self.embeddings:
+            self.embeddings.unload()
+        self._static_prompt_prefix = None
+
+        # BM25 over an inverted index, with field weights folded into term frequency
+        postings = defaultdict(list)
+        doc_lengths = []
+        soa = self._chunks_soa
+        for i, (name, docstring, path) in enumerate(zip(soa["name"], soa["docstring"], soa["file_path"])):
+            tf = Counter()
+            for token in _tokenize(name):
+                tf[token] += NAME_WEIGHT
+            for token in _tokenize(docstring or ""):
+                tf[token] += DOC_WEIGHT
+            for token in _tokenize(path):
+                tf[token] += PATH_WEIGHT
+            for token, freq in tf.items():
+                postings[token].append((i, freq))
+            doc_lengths.append(sum(tf.values()))
+
+        n = len(doc_lengths)
+        avg_length = (sum(doc_lengths) / n) if n else 1
+        self._length_norms = [
+            BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length) for length in doc_lengths
+        ]
+        # token -> (idf, [(chunk index, weighted tf), ...])
+        self._postings = {
+            token: (math.log(1 + (n - len(plist) + 0.5) / (len(plist) + 0.5)), plist)
+            for token, plist in postings.items()
+        }
+
+    def refresh(self):
+        """Reload chunks if the project was re-scanned since they were loaded"""
+        with self._init_lock:
+            if self._chunks_soa is None or self.storage.version() != self._chunks_version:
+                self.initialize()
+
+    def _warm_up(self):
+        """Load chunks and the embedding model before the first question arrives"""
+        try:
+            self.refresh()
+            if self.embeddings.exists():
+                self.embeddings.load()
+        except Exception:
+            pass  # The first question will load them again and report real errors
+
+    def _make_prompt(self):
+        """Return a function that reads the next question from the user"""
+        try:
+            from prompt_toolkit import PromptSession
+            from prompt_toolkit.history import FileHistory, InMemoryHistory
+        except ImportError:
+            return lambda: input("You: ")
+
+        if self.aibuddy_dir:
+            history = FileHistory(str(self.aibuddy_dir / ".prompt_history"))
+        else:
+            history = InMemoryHistory()
+        session = PromptSession(history=history)
+        return lambda: session.prompt("You: ")
 
     def set_provider(self, provider: str):
         """Set AI provider dynamically"""
@@ -21,6 +216,7 @@ class ChatAI:
             console.print("[red]Invalid provider. Choose openai, anthropic, or ollama.[/red]")
             return False
         self.provider = provider.lower()
+        self._static_prompt_prefix = None
         set_config_value("provider", self.provider)
         console.print(f"[green]Provider set to {self.provider}[/green]")
         return True
@@ -28,6 +224,7 @@ class ChatAI:
     def set_model(self, model: str):
         """Set AI model dynamically"""
         self.model = model
+        self._static_prompt_prefix = None
         set_config_value("model", self.model)
         console.print(f"[green]Model set to {self.model}[/green]")
 
@@ -38,102 +235,371 @@ class ChatAI:
             "Answer questions about Python codebases. Be concise and clear."
         )
 
-    def _get_openai_response(self, question: str) -> str:
+    def _build_project_context(self) -> str:
+        """One line per scanned file listing its functions and classes"""
+        if not self._chunks_soa:
+            return ""
+        soa = self._chunks_soa
+        files = {}
+        for path, chunk_type, name in zip(soa["file_path"], soa["chunk_type"], soa["name"]):
+            names = files.setdefault(path, [])
+            if chunk_type != "module":
+                names.append(name)
+
+        lines = []
+        size = 0
+        for path, names in files.items():
+            line = f"{path}: {', '.join(names)}" if names else path
+            lines.append(line)
+            size += len(line) + 1
+            if size > PROJECT_CONTEXT_CHARS:
+                break  # The prompt only keeps this many characters
+        return "\n".join(lines)
+
+    def _get_static_prompt_prefix(self) -> str:
+        """Part of the system prompt that is identical for every question"""
+        if self._static_prompt_prefix is None:
+            parts = [self._get_system_prompt()]
+            project_context = self._build_project_context()
+            if project_context:
+                parts.append("PROJECT STRUCTURE:\n" + project_context[:PROJECT_CONTEXT_CHARS])
+            guidelines = PROMPT_GUIDELINES if self.verbose else PROMPT_GUIDELINES + [CONCISE_GUIDELINE]
+            parts.append("GUIDELINES:\n" + "\n".join(guidelines))
+            self._static_prompt_prefix = "\n\n".join(parts)
+        return self._static_prompt_prefix
+
+    def _find_relevant_chunks(self, question: str, limit: int = 5):
+        """Find stored code chunks most related to the question"""
+        if not self.storage:
+            return []
+        self.refresh()
+
+        if self.embeddings.exists():
+            try:
+                ids = self.embeddings.search(question, limit)
+            except ImportError:
+                ids = None
+            if ids is not None:
+                return self.storage.get_chunks_by_ids(ids)
+
+        scores = Counter()
+        norms = self._length_norms
+        for token in set(_tokenize(question)):
+            if token not in self._postings:
+                continue
+            idf, plist = self._postings[token]
+            for i, tf in plist:
+                scores[i] += idf * tf * (BM25_K1 + 1) / (tf + norms[i])
+
+        # Highest score first, earlier chunks win ties
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+        chunk_ids = self._chunks_soa["id"]
+        return self.storage.get_chunks_by_ids([chunk_ids[i] for i, _ in top])
+
+    def _build_system_prompt(self, question: str):
+        """System prompt parts: the static prefix first, then code relevant to the question.
+
+        Keeping the prefix byte-identical across turns lets providers reuse
+        their prompt cache for it.
+        """
+        chunks = self._find_relevant_chunks(question)
+        prefix = self._get_static_prompt_prefix()
+        if not chunks:
+            return [prefix]
+
+        # Best matches first; stop once the budget is spent but always keep one
+        sections = []
+        seen = set()
+        budget = CODE_SECTIONS_TOKEN_BUDGET
+        for c in chunks:
+            # Vendored or copy-pasted code would otherwise be sent twice
+            digest = c.get("content_hash")
+            if digest is not None:
+                if digest in seen:
+                    continue
+                seen.add(digest)
+            section = _compress_section(c)
+            budget -= _count_tokens(section)
+            if sections and budget < 0:
+                break
+            sections.append(section)
+        return [prefix, "\n\nRELEVANT CODE SECTIONS:\n\n" + "\n\n".join(sections)]
+
+    @staticmethod
+    def _pooled_httpx_client():
+        """HTTP client that keeps TLS connections alive across turns"""
         try:
-            import openai
+            import httpx
         except ImportError:
-            return "OpenAI library not installed. Run: pip install openai"
+            return None  # Let the SDK use its own default client
+        return httpx.Client(
+            timeout=30,
+            limits=httpx.Limits(max_keepalive_connections=20, max_connections=40)
+        )
+
+    def _get_http(self):
+        """Create the keep-alive session for Ollama once per session"""
+        if self._http is None:
+            # ask_batch workers can get here together; build the session once
+            with self._init_lock:
+                if self._http is None:
+                    import requests
+
+                    # One connection pool per session, sized for ask_batch
+                    http = requests.Session()
+                    http.headers.update({"Connection": "keep-alive"})
+                    adapter = requests.adapters.HTTPAdapter(pool_maxsize=BATCH_CONCURRENCY)
+                    http.mount("http://", adapter)
+                    http.mount("https://", adapter)
+                    self._http = http
+        return self._http
+
+    def _get_openai_client(self):
+        """Create the OpenAI client once per session"""
+        if self._openai_client is None:
+            with self._init_lock:
+                if self._openai_client is None:
+                    try:
+                        import openai
+                    except ImportError:
+                        raise ProviderError("OpenAI library not installed. Run: pip install openai")
+
+                    api_key = get_api_key("openai")
+                    if not api_key:
+                        raise ProviderError("OpenAI API key not set. Use 'ath config set openai_key <key>'")
+
+                    self._openai_client = openai.OpenAI(api_key=api_key, http_client=self._pooled_httpx_client())
+        return self._openai_client
+
+    def _get_anthropic_client(self):
+        """Create the Anthropic client once per session"""
+        if self._anthropic_client is None:
+            with self._init_lock:
+                if self._anthropic_client is None:
+                    try:
+                        import anthropic
+                    except ImportError:
+                        raise ProviderError("Anthropic library not installed. Run: pip install anthropic")
 
-        api_key = get_api_key("openai")
-        if not api_key:
-            return "OpenAI API key not set. Use 'ath config set openai_key <key>'"
+                    api_key = get_api_key("anthropic")
+                    if not api_key:
+                        raise ProviderError("Anthropic API key not set. Use 'ath config set anthropic_key <key>'")
 
-        openai.api_key = api_key
+                    self._anthropic_client = anthropic.Anthropic(api_key=api_key, http_client=self._pooled_httpx_client())
+        return self._anthropic_client
+
+    def _stream_openai_response(self, system_parts, question: str):
+        client = self._get_openai_client()
         try:
-            resp = openai.ChatCompletion.create(
+            stream = client.chat.completions.create(
                 model=self.model,
                 messages=[
-                    {"role": "system", "content": self._get_system_prompt()},
+                    {"role": "system", "content": "".join(system_parts)},
                     {"role": "user", "content": question}
                 ],
-                max_tokens=500,
-                temperature=0.7
+                max_tokens=self.max_tokens,
+                temperature=self.temperature,
+                # In the body so SDK versions without this keyword still work
+                extra_body={"prompt_cache_key": "ath_v1"},
+                stream=True
             )
-            return resp.choices[0].message.content.strip()
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
         except Exception as e:
-            return f"OpenAI API error: {e}"
-
-    def _get_anthropic_response(self, question: str) -> str:
-        try:
-            import anthropic
-        except ImportError:
-            return "Anthropic library not installed. Run: pip install anthropic"
-
-        api_key = get_api_key("anthropic")
-        if not api_key:
-            return "Anthropic API key not set. Use 'ath config set anthropic_key <key>'"
+            raise ProviderError(f"OpenAI API error: {e}")
 
-        client = anthropic.Client(api_key=api_key)
-        prompt = f"{self._get_system_prompt()}\n\nUser: {question}\nAssistant:"
+    def _stream_anthropic_response(self, system_parts, question: str):
+        client = self._get_anthropic_client()
         try:
-            msg = client.completions.create(
+            with client.messages.stream(
                 model=self.model,
-                prompt=prompt,
-                max_tokens_to_sample=500
-            )
-            return msg.completion
+                system=[
+                    {"type": "text", "text": system_parts[0], "cache_control": {"type": "ephemeral"}},
+                    *({"type": "text", "text": part} for part in system_parts[1:])
+                ],
+                messages=[{"role": "user", "content": question}],
+                max_tokens=self.max_tokens,
+                # Sent in the body: not every SDK version takes it as a keyword
+                extra_body={"temperature": self.temperature}
+            ) as stream:
+                for text in stream.text_stream:
+                    yield text
         except Exception as e:
-            return f"Anthropic API error: {e}"
+            raise ProviderError(f"Anthropic API error: {e}")
+
+    def select_model_by_complexity(self, question: str) -> str:
+        """Pick the fast model for simple Ollama questions, otherwise the configured one"""
+        if self.provider != "ollama" or not self.fast_model:
+            return self.model
+        if "```" in question or len(question.split()) > SIMPLE_QUESTION_WORDS:
+            return self.model
+        return self.fast_model
+
+    def _stream_ollama_response(self, system_parts, question: str, model: str = None):
+        """Stream response tokens from local Ollama"""
+        import requests
 
-    def _get_ollama_response(self, question: str) -> str:
-        """Send request to local Ollama"""
+        model = model or self.model
         try:
-            system_prompt = self._get_system_prompt()
             payload = {
-                "model": self.model,
-                "prompt": f"{system_prompt}\n\nUser: {question}",
-                "stream": False
+                "model": model,
+                "prompt": f"{''.join(system_parts)}\n\nUser: {question}",
+                "stream": True,
+                "options": {"temperature": self.temperature, "num_predict": self.max_tokens}
             }
-            r = requests.post("http://localhost:11434/api/generate", json=payload, timeout=30)
-            if r.status_code == 200:
-                return r.json().get("response", "No response from Ollama")
-            else:
-                return f"Ollama API error: {r.status_code}"
+            with self._get_http().post("http://localhost:11434/api/generate", json=payload, timeout=30, stream=True) as r:
+                if r.status_code == 404 and model != self.model:
+                    # Fast model not pulled; stop routing to it for the rest of the
+                    # session and answer with the configured model instead
+                    self.fast_model = None
+                    yield from self._stream_ollama_response(system_parts, question, self.model)
+                    return
+                if r.status_code != 200:
+                    raise ProviderError(f"Ollama API error: {r.status_code}")
+                for line in r.iter_lines():
+                    if not line:
+                        continue
+                    data = _json_loads(line)
+                    if data.get("response"):
+                        yield data["response"]
+                    if data.get("done"):
+                        break
+        except ProviderError:
+            raise
         except requests.exceptions.ConnectionError:
-            return "Cannot connect to Ollama. Make sure it's running: ollama serve"
+            raise ProviderError("Cannot connect to Ollama. Make sure it's running: ollama serve")
         except Exception as e:
-            return f"Ollama error: {e}"
+            raise ProviderError(f"Ollama error: {e}")
+
+    def _try_direct_answer(self, question: str):
+        """Answer simple lookups from storage, or return None to ask the provider"""
+        if not self.storage:
+            return None
+        question = question.strip()
+
+        match = WHERE_IS_RE.match(question)
+        if match:
+            chunks = self.storage.get_chunks_by_name(match.group(1))
+            if chunks:
+                return "\n".join(
+                    f"{c['name']} is a {c['chunk_type']} in {c['file_path']} (lines {c['line_start']}-{c['line_end']})"
+                    for c in chunks
+                )
+
+        match = LIST_IN_RE.match(question)
+        if match:
+            chunk_type = "function" if match.group(1).lower() == "functions" else "class"
+            file_path = match.group(2).replace("\\", "/")
+            chunks = self.storage.get_chunks_by_file(file_path)
+            if chunks:
+                names = [c["name"] for c in chunks if c["chunk_type"] == chunk_type]
+                if not names:
+                    return f"No {match.group(1).lower()} found in {file_path}"
+                return f"{match.group(1).capitalize()} in {file_path}: " + ", ".join(names)
+
+        match = WHAT_DOES_RE.match(question)
+        if match:
+            chunks = [c for c in self.storage.get_chunks_by_name(match.group(1)) if c["docstring"]]
+            if len(chunks) == 1:
+                c = chunks[0]
+                return f"{c['name']} ({c['file_path']}): {c['docstring']}"
+
+        return None
+
+    def _response_stream(self, question: str):
+        """Yield response chunks for a question, using the cache when possible"""
+        self._stats["questions"] += 1
+        direct = self._try_direct_answer(question)
+        if direct is not None:
+            self._stats["direct_hits"] += 1
+            yield direct
+            return
+
+        system_parts = self._build_system_prompt(question)
+        model = self.select_model_by_complexity(question)
+        cache_key = None
+        if self.cache and self.temperature <= CACHE_MAX_TEMPERATURE:
+            cache_key = ResponseCache.make_key(
+                self.provider, model, "".join(system_parts), question, self.max_tokens, self.temperature
+            )
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                yield cached
+                return
 
-    def ask(self, question: str) -> str:
-        """Ask a question to the selected provider"""
-        self.conversation_history.append({"question": question})
         if self.provider == "openai":
-            resp = self._get_openai_response(question)
+            stream = self._stream_openai_response(system_parts, question)
         elif self.provider == "anthropic":
-            resp = self._get_anthropic_response(question)
+            stream = self._stream_anthropic_response(system_parts, question)
         elif self.provider == "ollama":
-            resp = self._get_ollama_response(question)
+            stream = self._stream_ollama_response(system_parts, question, model)
         else:
-            resp = f"Unknown provider: {self.provider}"
-        self.conversation_history[-1]["response"] = resp
-        return resp
+            stream = iter([f"Unknown provider: {self.provider}"])
+            cache_key = None
+
+        parts = []
+        try:
+            for chunk in stream:
+                parts.append(chunk)
+                yield chunk
+        except ProviderError as e:
+            parts.append(str(e))
+            cache_key = None
+            yield str(e)
+
+        resp = "".join(parts)
+        if cache_key and resp:
+            self.cache.set(cache_key, resp)
+
+    def ask_stream(self, question: str):
+        """Ask a question and yield response chunks as they arrive"""
+        turn = {"question": question}
+        self.conversation_history.append(turn)
+        parts = []
+        for chunk in self._response_stream(question):
+            parts.append(chunk)
+            yield chunk
+        turn["response"] = "".join(parts)
+
+    def ask(self, question: str) -> str:
+        """Ask a question to the selected provider"""
+        return "".join(self.ask_stream(question))
+
+    def ask_batch(self, questions, concurrency: int = BATCH_CONCURRENCY):
+        """Answer several independent questions concurrently, in order"""
+        if self.storage:
+            self.refresh()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            return list(executor.map(lambda q: "".join(self._response_stream(q)), questions))
 
     def start_interactive_chat(self):
         """Interactive console chat"""
         console.print(f"[blue]Ath AI Chat activated using {self.provider} ({self.model})[/blue]")
         console.print("[dim]Type 'exit', 'quit', or 'q' to stop.[/dim]\n")
-        while True:
-            try:
-                question = input("You: ").strip()
-                if question.lower() in ["exit", "quit", "q"]:
+        if self.storage:
+            threading.Thread(target=self._warm_up, daemon=True).start()
+        read_question = self._make_prompt()
+        chat_log = self.storage.open_chat_log() if self.storage else None
+        try:
+            while True:
+                try:
+                    question = read_question().strip()
+                    if question.lower() in ["exit", "quit", "q"]:
+                        break
+                    if not question:
+                        continue
+                    console.print("[green]Ath:[/green] ", end="")
+                    for chunk in self.ask_stream(question):
+                        console.print(chunk, end="", markup=False, highlight=False)
+                    console.print("\n")
+                    if chat_log:
+                        chat_log.write(json.dumps(self.conversation_history[-1]) + "\n")
+                except KeyboardInterrupt:
                     break
-                if not question:
-                    continue
-                with console.status("[dim]Thinking...[/dim]"):
-                    answer = self.ask(question)
-                console.print(f"[green]Ath:[/green] {answer}\n")
-            except KeyboardInterrupt:
-                break
-            except EOFError:
-                break
+                except EOFError:
+                    break
+        finally:
+            if chat_log:
+                chat_log.close()
         console.print("[blue]Chat ended.[/blue]")
@@ -1,13 +1,10 @@
 import typer
-import shutil
 from pathlib import Path
 from rich.console import Console
-from rich.progress import Progress
-from .scanner import ProjectScanner
-from .storage import LocalStorage
 from .utils import find_project_root, find_aibuddy_dir
-from .utils import get_project_stats
-from .ai_chat import ChatAI
+
+# Heavier modules (scanner, storage, ai_chat and their dependencies) are imported
+# inside the commands that use them so one-shot commands start quickly.
 
 app = typer.Typer(help="Ath - Your personal, per-folder AI assistant")
 console = Console()
@@ -16,6 +13,11 @@ console = Console()
 @app.command()
 def init(force: bool = typer.Option(False, "--force", "-f", help="Force re-initialization")):
     """Initialize AI agent for current project"""
+    import shutil
+    from rich.progress import Progress
+    from .scanner import ProjectScanner
+    from .storage import LocalStorage
+
     project_root = find_project_root()
     aibuddy_dir = project_root / ".aibuddy"
 
@@ -48,12 +50,22 @@ def init(force: bool = typer.Option(False, "--force", "-f", help="Force re-initi
 
     storage.store_code_chunks(code_chunks)
     console.print(f"✓ Processed {len(code_chunks)} code chunks")
+    if scanner.skipped_files:
+        console.print(f"[yellow]Skipped {len(scanner.skipped_files)} files over 1 MB[/yellow]")
+
+    from .embeddings import EmbeddingDB, embeddings_available
+    if embeddings_available():
+        with console.status("Building semantic index..."):
+            EmbeddingDB(aibuddy_dir).build(storage.get_all_chunks())
+        console.print("✓ Built semantic index")
     console.print("[bold green]Project initialized successfully![/bold green]")
 
 
 @app.command()
 def status():
     """Show project status and statistics"""
+    from .utils import get_project_stats
+
     aibuddy_dir = find_aibuddy_dir()
     if not aibuddy_dir:
         console.print("[red]No AI agent found. Run 'ath init' first.[/red]")
@@ -80,8 +92,14 @@ def status():
 
 
 @app.command()
-def chat(provider: str = typer.Option(None, "--provider", "-p", help="AI provider: openai, anthropic, ollama")):
+def chat(
+    provider: str = typer.Option(None, "--provider", "-p", help="AI provider: openai, anthropic, ollama"),
+    verbose: bool = typer.Option(False, "--verbose", "-v", help="Allow longer, more detailed answers")
+):
     """Start interactive chat with project AI"""
+    from .storage import LocalStorage
+    from .ai_chat import ChatAI
+
     aibuddy_dir = find_aibuddy_dir()
     if not aibuddy_dir:
         console.print("[red]No AI agent found. Run 'ath init' first.[/red]")
@@ -92,8 +110,7 @@ def chat(provider: str = typer.Option(None, "--provider", "-p", help="AI provide
 
     storage = LocalStorage(aibuddy_dir)
     try:
-        code_chunks = storage.get_all_chunks()
-        if not code_chunks:
+        if not storage.get_chunk_stats()["total_chunks"]:
             console.print("[yellow]No code chunks found. Run 'ath init' to scan your project.[/yellow]")
             return
     except Exception as e:
@@ -101,7 +118,7 @@ def chat(provider: str = typer.Option(None, "--provider", "-p", help="AI provide
         console.print("[yellow]Try running 'ath init --force' to fix the database.[/yellow]")
         return
 
-    chat_ai = ChatAI()
+    chat_ai = ChatAI(aibuddy_dir, verbose=verbose)
     if provider:
         chat_ai.set_provider(provider)
     chat_ai.start_interactive_chat()
@@ -110,6 +127,8 @@ def chat(provider: str = typer.Option(None, "--provider", "-p", help="AI provide
 @app.command()
 def inspect(file_path: str = typer.Argument(help="File to inspect")):
     """Show what code chunks were extracted from a file"""
+    from .storage import LocalStorage
+
     aibuddy_dir = find_aibuddy_dir()
     if not aibuddy_dir:
         console.print("[red]No AI agent found. Run 'ath init' first.[/red]")
@@ -145,7 +164,11 @@ def config(
         if not key or not value:
             console.print("[red]You must provide key and value to set.[/red]")
             return
-        set_config_value(key, value)
+        try:
+            set_config_value(key, value)
+        except ValueError:
+            console.print(f"[red]{key} must be a number.[/red]")
+            return
         console.print(f"[green]Set {key} to {value}[/green]")
     elif action == "get":
         if not key:
@@ -156,5 +179,52 @@ def config(
     else:
         console.print("[red]Unknown config action. Use show, set, or get.[/red]")
 
+
+@app.command()
+def batch(file: Path = typer.Option(..., "--file", "-f", help="Text file with one question per line")):
+    """Answer a file of questions concurrently"""
+    from .ai_chat import ChatAI
+
+    aibuddy_dir = find_aibuddy_dir()
+    if not aibuddy_dir:
+        console.print("[red]No AI agent found. Run 'ath init' first.[/red]")
+        return
+
+    if not file.exists():
+        console.print(f"[red]File not found: {file}[/red]")
+        return
+
+    questions = [line.strip() for line in file.read_text(encoding="utf-8").splitlines() if line.strip()]
+    if not questions:
+        console.print("[yellow]No questions found in file.[/yellow]")
+        return
+
+    chat_ai = ChatAI(aibuddy_dir)
+    with console.status(f"[dim]Answering {len(questions)} questions...[/dim]"):
+        answers = chat_ai.ask_batch(questions)
+
+    # Questions and answers are printed as plain text: brackets in them are not markup
+    for question, answer in zip(questions, answers):
+        console.print("[blue]Q:[/blue] ", end="")
+        console.print(question, markup=False, highlight=False)
+        console.print("[green]Ath:[/green] ", end="")
+        console.print(answer + "\n", markup=False, highlight=False)
+
+
+@app.command()
+def cache(action: str = typer.Argument(..., help="Action: clear")):
+    """Manage the cached AI responses for this project"""
+    aibuddy_dir = find_aibuddy_dir()
+    if not aibuddy_dir:
+        console.print("[red]No AI agent found. Run 'ath init' first.[/red]")
+        return
+
+    if action == "clear":
+        from .llm_cache import ResponseCache
+        removed = ResponseCache(aibuddy_dir).clear()
+        console.print(f"[green]Cleared {removed} cached responses[/green]")
+    else:
+        console.print("[red]Unknown cache action. Use clear.[/red]")
+
 if __name__ == "__main__":
     app()
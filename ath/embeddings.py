@@ -0,0 +1,172 @@
+import math
+import sqlite3
+import hashlib
+import threading
+import time
+from pathlib import Path
+from typing import List, Dict, Any
+
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+ENCODE_BATCH_SIZE = 64
+
+# Shared across projects and kept outside .aibuddy so 'ath init --force' reuses it
+EMBEDDING_CACHE_PATH = Path.home() / ".ath" / "embeddings.db"
+# Bump when the embeddings table changes
+EMBEDDING_CACHE_VERSION = 2
+# Vectors no build has used for this long are dropped; a later build re-encodes them
+EMBEDDING_CACHE_MAX_AGE = 30 * 24 * 3600
+
+# Below this many chunks a flat index is exact and still fast enough
+IVF_MIN_CHUNKS = 1000
+# Above this many chunks full vectors no longer fit comfortably in memory
+IVFPQ_MIN_CHUNKS = 1_000_000
+
+
+def embeddings_available() -> bool:
+    """Check if the optional semantic search dependencies are installed"""
+    try:
+        import faiss  # noqa: F401
+        import sentence_transformers  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def chunk_text(chunk: Dict[str, Any]) -> str:
+    """Text that represents a chunk in embedding space"""
+    return f"{chunk['name']} {chunk['docstring'] or ''} {chunk['file_path']}"
+
+
+class EmbeddingDB:
+    """FAISS index over code chunk embeddings, persisted in .aibuddy"""
+
+    def __init__(self, aibuddy_dir: Path):
+        self.index_path = aibuddy_dir / "faiss.idx"
+        self._model = None
+        self._index = None
+        # Chat warm-up and the first question may load at the same time
+        self._lock = threading.RLock()
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    from sentence_transformers import SentenceTransformer
+                    self._model = SentenceTransformer(EMBEDDING_MODEL)
+        return self._model
+
+    def exists(self) -> bool:
+        return self.index_path.exists()
+
+    def load(self):
+        """Load the embedding model and index ahead of the first search, returning the index"""
+        import faiss
+
+        with self._lock:
+            self.model  # Property loads the model on first access
+            if self._index is None:
+                self._index = faiss.read_index(str(self.index_path))
+            return self._index
+
+    def unload(self):
+        """Drop the in-memory index so the next search reads it from disk"""
+        with self._lock:
+            self._index = None
+
+    def _encode(self, texts: List[str]):
+        """Embed texts in batches, reusing vectors cached by content hash"""
+        import numpy as np
+
+        keys = [hashlib.sha256(f"{EMBEDDING_MODEL}:{text}".encode("utf-8")).hexdigest() for text in texts]
+
+        EMBEDDING_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(EMBEDDING_CACHE_PATH)
+        if conn.execute("PRAGMA user_version").fetchone()[0] != EMBEDDING_CACHE_VERSION:
+            conn.execute("DROP TABLE IF EXISTS embeddings")
+            conn.execute(f"PRAGMA user_version = {EMBEDDING_CACHE_VERSION}")
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                vector BLOB NOT NULL,
+                seen_at REAL NOT NULL
+            )
+        ''')
+        now = time.time()
+
+        cached = {}
+        unique_keys = list(set(keys))
+        for i in range(0, len(unique_keys), 500):
+            batch = unique_keys[i:i + 500]
+            placeholders = ",".join("?" * len(batch))
+            for key, blob in conn.execute(f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch):
+                cached[key] = np.frombuffer(blob, dtype="float32")
+
+        conn.executemany("UPDATE embeddings SET seen_at = ? WHERE key = ?", ((now, key) for key in cached))
+
+        missing = [i for i, key in enumerate(keys) if key not in cached]
+        if missing:
+            vecs = self.model.encode(
+                [texts[i] for i in missing],
+                batch_size=ENCODE_BATCH_SIZE,
+                convert_to_numpy=True
+            ).astype("float32")
+            for i, vec in zip(missing, vecs):
+                cached[keys[i]] = vec
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector, seen_at) VALUES (?, ?, ?)",
+                ((keys[i], vec.tobytes(), now) for i, vec in zip(missing, vecs))
+            )
+        conn.execute("DELETE FROM embeddings WHERE seen_at < ?", (now - EMBEDDING_CACHE_MAX_AGE,))
+        conn.commit()
+        conn.close()
+
+        return np.stack([cached[key] for key in keys])
+
+    def build(self, chunks: List[Dict[str, Any]]):
+        """Embed stored chunks and write the index to disk"""
+        import faiss
+        import numpy as np
+
+        if not chunks:
+            return
+
+        # Cosine similarity: inner product over L2-normalized vectors
+        vecs = np.ascontiguousarray(self._encode([chunk_text(c) for c in chunks]), dtype="float32")
+        faiss.normalize_L2(vecs)
+        ids = np.array([c["id"] for c in chunks], dtype="int64")
+        n, dim = vecs.shape
+
+        if n >= IVF_MIN_CHUNKS:
+            nlist = int(math.sqrt(n))
+            quantizer = faiss.IndexFlatIP(dim)
+            if n >= IVFPQ_MIN_CHUNKS:
+                index = faiss.IndexIVFPQ(quantizer, dim, nlist, 16, 8, faiss.METRIC_INNER_PRODUCT)
+            else:
+                index = faiss.IndexIVFScalarQuantizer(
+                    quantizer, dim, nlist, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT
+                )
+            index.nprobe = min(nlist, 8)
+        else:
+            # int8 codes are a quarter the size of float32 vectors
+            index = faiss.IndexIDMap(
+                faiss.IndexScalarQuantizer(dim, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT)
+            )
+        index.train(vecs)
+
+        # One bulk add for every vector
+        index.add_with_ids(vecs, ids)
+        faiss.write_index(index, str(self.index_path))
+        with self._lock:
+            self._index = index
+
+    def search(self, question: str, k: int = 5) -> List[int]:
+        """Return ids of the chunks closest to the question"""
+        index = self.load()
+        import faiss
+        import numpy as np
+
+        query = np.ascontiguousarray(self.model.encode([question]), dtype="float32")
+        faiss.normalize_L2(query)
+        _, ids = index.search(query, k)
+        return [int(i) for i in ids[0] if i != -1]
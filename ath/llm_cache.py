@@ -0,0 +1,62 @@
+import sqlite3
+import hashlib
+import time
+from pathlib import Path
+from typing import Optional
+
+
+class ResponseCache:
+    """SQLite-backed cache of AI responses keyed by provider, model and prompt"""
+
+    def __init__(self, aibuddy_dir: Path, expire: int = 3600):
+        self.db_path = aibuddy_dir / "llm_cache.db"
+        self.expire = expire
+        self._init_db()
+
+    def _init_db(self):
+        """Create cache table if it does not exist"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    @staticmethod
+    def make_key(provider: str, model: str, system: str, question: str,
+                 max_tokens: int, temperature: float) -> str:
+        """Build a stable cache key for a prompt and the settings that shape its response"""
+        raw = f"{provider}:{model}:{max_tokens}:{temperature}:{system}:{question}"
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """Return cached response, or None if missing or expired"""
+        conn = sqlite3.connect(self.db_path)
+        row = conn.execute(
+            "SELECT response FROM llm_cache WHERE key = ? AND expires_at > ?",
+            (key, time.time())
+        ).fetchone()
+        conn.close()
+        return row[0] if row else None
+
+    def set(self, key: str, response: str):
+        """Store a response for the configured lifetime"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute(
+            "INSERT OR REPLACE INTO llm_cache (key, response, expires_at) VALUES (?, ?, ?)",
+            (key, response, time.time() + self.expire)
+        )
+        conn.commit()
+        conn.close()
+
+    def clear(self) -> int:
+        """Remove all cached responses, returning how many were dropped"""
+        conn = sqlite3.connect(self.db_path)
+        count = conn.execute("DELETE FROM llm_cache").rowcount
+        conn.commit()
+        conn.close()
+        return count
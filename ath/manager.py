@@ -1,24 +1,38 @@
 import os
 import json
+import copy
 from pathlib import Path
 
 CONFIG_PATH = Path.home() / ".ath" / "config.json"
 
+# Config keys stored as numbers rather than strings
+NUMERIC_KEYS = {"max_tokens": int, "temperature": float}
+
+# Parsed config, reused until the file's mtime changes
+_cache = {"mtime": None, "cfg": None}
+
 def load_config():
     """Load Ath config file"""
-    if not CONFIG_PATH.exists():
-        return {"provider": "ollama", "model": "codellama:7b", "api_keys": {}}
     try:
-        with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception:
+        mtime = CONFIG_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
         return {"provider": "ollama", "model": "codellama:7b", "api_keys": {}}
+    if _cache["mtime"] != mtime:
+        try:
+            with open(CONFIG_PATH, "r", encoding="utf-8") as f:
+                _cache["cfg"] = json.load(f)
+        except Exception:
+            return {"provider": "ollama", "model": "codellama:7b", "api_keys": {}}
+        _cache["mtime"] = mtime
+    # Callers modify the config they get back, so never hand out the cached one
+    return copy.deepcopy(_cache["cfg"])
 
 def save_config(cfg):
     """Save config file"""
     os.makedirs(CONFIG_PATH.parent, exist_ok=True)
     with open(CONFIG_PATH, "w", encoding="utf-8") as f:
         json.dump(cfg, f, indent=2)
+    _cache["mtime"] = None
 
 def get_config_value(key, default=None):
     """Get a specific config value"""
@@ -27,6 +41,8 @@ def get_config_value(key, default=None):
 
 def set_config_value(key, value):
     """Set a config value"""
+    if key in NUMERIC_KEYS:
+        value = NUMERIC_KEYS[key](value)
     cfg = load_config()
     if key in ["openai_key", "anthropic_key", "ollama_key"]:
         provider = key.split("_")[0]
@@ -1,8 +1,29 @@
 import ast
 import os
+import json
+import sqlite3
+import time
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
-from dataclasses import dataclass
+from typing import List, Dict, Any, Tuple, Optional
+from dataclasses import dataclass, asdict
+
+# Below this many files, process pool startup costs more than parsing serially
+PARALLEL_MIN_FILES = 32
+
+# Larger .py files are almost always generated or vendored, not worth parsing
+MAX_FILE_SIZE = 1024 * 1024
+
+# Shared across projects and kept outside .aibuddy so 'ath init --force' reuses it
+SCAN_CACHE_PATH = Path.home() / ".ath" / "scan_cache.db"
+# Bump when parsing changes what chunks a file produces or the table changes
+SCAN_CACHE_VERSION = 3
+# Entries not seen by any scan for this long belong to deleted files or projects
+SCAN_CACHE_MAX_AGE = 30 * 24 * 3600
+
+# Statement lists that can contain function or class definitions
+_BODY_FIELDS = ('body', 'orelse', 'finalbody', 'handlers', 'cases')
 
 @dataclass
 class CodeChunk:
@@ -17,80 +38,203 @@ class CodeChunk:
 class ProjectScanner:
     def __init__(self, project_path: Path):
         self.project_path = project_path
-        self.ignore_patterns = {'.git', '__pycache__', '.aibuddy', 'node_modules', '.env'}
+        self.ignore_patterns = frozenset({
+            '.git', '__pycache__', '.aibuddy', 'node_modules', '.env',
+            '.venv', 'venv', '.tox', '.nox', '.mypy_cache', '.pytest_cache'
+        })
+        self.skipped_files: List[Path] = []
     
     def scan_project(self) -> List[CodeChunk]:
-        """Scan project and extract code chunks"""
+        """Scan project and extract code chunks, reparsing only changed files"""
+        files = self._find_python_files()
+
+        SCAN_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(SCAN_CACHE_PATH)
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SCAN_CACHE_VERSION:
+            conn.execute("DROP TABLE IF EXISTS file_cache")
+            conn.execute(f"PRAGMA user_version = {SCAN_CACHE_VERSION}")
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS file_cache (
+                path TEXT PRIMARY KEY,
+                mtime INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                chunks_json BLOB NOT NULL,
+                seen_at REAL NOT NULL
+            )
+        ''')
+        now = time.time()
+
+        # Files whose mtime and size match the cache reuse their chunks
+        results = {}
+        fresh = []
+        stale = []
+        for file_path, st in files:
+            row = conn.execute(
+                "SELECT mtime, size, chunks_json FROM file_cache WHERE path = ?",
+                (str(file_path),)
+            ).fetchone()
+            if row and row[0] == st.st_mtime_ns and row[1] == st.st_size:
+                relative_path = str(file_path.relative_to(self.project_path))
+                results[file_path] = [CodeChunk(file_path=relative_path, **c) for c in json.loads(row[2])]
+                fresh.append(str(file_path))
+            else:
+                stale.append((file_path, st))
+
+        parse = partial(_parse_python_file, project_path=self.project_path)
+        stale_paths = [file_path for file_path, _ in stale]
+        if len(stale_paths) < PARALLEL_MIN_FILES:
+            parsed = list(map(parse, stale_paths))
+        else:
+            # AST parsing is CPU-bound, so spread files across processes. Each
+            # worker reads its own files, so disk reads overlap with parsing too.
+            with ProcessPoolExecutor() as executor:
+                parsed = list(executor.map(parse, stale_paths, chunksize=16))
+
+        # Failed parses (None) are not cached so the next scan retries them
+        conn.executemany(
+            "INSERT OR REPLACE INTO file_cache (path, mtime, size, chunks_json, seen_at) VALUES (?, ?, ?, ?, ?)",
+            (
+                (str(file_path), st.st_mtime_ns, st.st_size,
+                 json.dumps([_cache_fields(c) for c in file_chunks]), now)
+                for (file_path, st), file_chunks in zip(stale, parsed)
+                if file_chunks is not None
+            )
+        )
+        conn.executemany("UPDATE file_cache SET seen_at = ? WHERE path = ?", ((now, path) for path in fresh))
+        conn.execute("DELETE FROM file_cache WHERE seen_at < ?", (now - SCAN_CACHE_MAX_AGE,))
+        conn.commit()
+        conn.close()
+
+        results.update((file_path, file_chunks or []) for file_path, file_chunks in zip(stale_paths, parsed))
         chunks = []
-        
-        for py_file in self._find_python_files():
-            file_chunks = self._parse_python_file(py_file)
-            chunks.extend(file_chunks)
-        
+        for file_path, _ in files:
+            chunks.extend(results[file_path])
         return chunks
     
-    def _find_python_files(self) -> List[Path]:
-        """Find all Python files in project"""
-        python_files = []
-        
-        for root, dirs, files in os.walk(self.project_path):
-            dirs[:] = [d for d in dirs if d not in self.ignore_patterns]
-            
-            for file in files:
-                if file.endswith('.py'):
-                    python_files.append(Path(root) / file)
-        
-        return python_files
+    def _find_python_files(self) -> List[Tuple[Path, os.stat_result]]:
+        """Find Python files in project with their stat, skipping oversized ones"""
+        files = []
+        self.skipped_files = []
+        for entry in self._iter_py_files(self.project_path):
+            try:
+                st = entry.stat()
+            except OSError as e:
+                # Dangling symlink or a file removed mid-scan
+                print(f"Error reading {entry.path}: {e}")
+                continue
+            if st.st_size > MAX_FILE_SIZE:
+                self.skipped_files.append(Path(entry.path))
+            else:
+                files.append((Path(entry.path), st))
+        return files
+
+    def _iter_py_files(self, root: Path):
+        """Yield DirEntry objects for Python files under root, pruning ignored directories.
+
+        DirEntry carries the file type from the directory listing, so no
+        per-entry stat is needed.
+        """
+        stack = [str(root)]
+        while stack:
+            try:
+                entries = os.scandir(stack.pop())
+            except OSError:
+                continue  # Unreadable directory; os.walk skipped these too
+            with entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    if is_dir:
+                        if entry.name not in self.ignore_patterns:
+                            stack.append(entry.path)
+                    elif entry.name.endswith('.py'):
+                        yield entry
+
+
+def _cache_fields(chunk: CodeChunk) -> Dict[str, Any]:
+    """Chunk fields worth caching; file_path is rebuilt from the project root"""
+    fields = asdict(chunk)
+    del fields['file_path']
+    return fields
+
+
+def _parse_python_file(file_path: Path, project_path: Path) -> Optional[List[CodeChunk]]:
+    """Parse a Python file and extract functions/classes.
+
+    Module-level so it can run in worker processes. Returns None if the
+    file could not be read or parsed.
+    """
+    chunks = []
     
-    def _parse_python_file(self, file_path: Path) -> List[CodeChunk]:
-        """Parse a Python file and extract functions/classes"""
-        chunks = []
-        
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            tree = ast.parse(content)
-
-            relative_path = str(file_path.relative_to(self.project_path))
-            module_chunk = CodeChunk(
-                file_path=relative_path,
-                chunk_type='module',
-                name=file_path.stem,
-                content=content[:500],  # First 500 chars
-                line_start=1,
-                line_end=len(content.split('\n')),
-                docstring=ast.get_docstring(tree) or ""
-            )
-            chunks.append(module_chunk)
-            
-            for node in ast.walk(tree):
-                if isinstance(node, (ast.FunctionDef, ast.ClassDef)):
-                    chunk = self._extract_node_chunk(node, content, relative_path)
-                    if chunk:
-                        chunks.append(chunk)
-        
-        except Exception as e:
-            print(f"Error parsing {file_path}: {e}")
+    try:
+        # Read whole: chunks are sliced from the decoded text, so mapping the
+        # file with mmap would not lower peak memory, and files over
+        # MAX_FILE_SIZE never get here
+        with open(file_path, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        tree = ast.parse(content)
+
+        relative_path = str(file_path.relative_to(project_path))
+        module_chunk = CodeChunk(
+            file_path=relative_path,
+            chunk_type='module',
+            name=file_path.stem,
+            content=content[:500],  # First 500 chars
+            line_start=1,
+            line_end=content.count('\n') + 1,
+            docstring=ast.get_docstring(tree) or ""
+        )
+        chunks.append(module_chunk)
         
-        return chunks
+        lines = None  # Only split when the file has definitions to extract
+        for node in _iter_definitions(tree):
+            if lines is None:
+                lines = content.split('\n')
+            chunk = _extract_node_chunk(node, lines, relative_path)
+            if chunk:
+                chunks.append(chunk)
     
-    def _extract_node_chunk(self, node: ast.AST, file_content: str, file_path: str) -> CodeChunk:
-        """Extract a function or class as a code chunk"""
-        lines = file_content.split('\n')
+    except Exception as e:
+        print(f"Error parsing {file_path}: {e}")
+        return None
+    
+    return chunks
 
-        start_line = node.lineno - 1
-        end_line = node.end_lineno if hasattr(node, 'end_lineno') else start_line + 10
-        code_content = '\n'.join(lines[start_line:end_line])
-        
-        chunk_type = 'function' if isinstance(node, ast.FunctionDef) else 'class'
-        
-        return CodeChunk(
-            file_path=file_path,
-            chunk_type=chunk_type,
-            name=node.name,
-            content=code_content,
-            line_start=node.lineno,
-            line_end=end_line,
-            docstring=ast.get_docstring(node) or ""
-        )
\ No newline at end of file
+
+def _iter_definitions(tree: ast.Module):
+    """Yield function (sync and async) and class nodes in source order.
+
+    Only statement bodies are descended into; definitions never appear inside
+    expressions, so skipping those avoids visiting most of the tree.
+    """
+    stack = list(reversed(tree.body))
+    while stack:
+        node = stack.pop()
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            yield node
+        for field in _BODY_FIELDS:
+            children = getattr(node, field, None)
+            if children:
+                stack.extend(reversed(children))
+
+
+def _extract_node_chunk(node: ast.AST, lines: List[str], file_path: str) -> CodeChunk:
+    """Extract a function or class as a code chunk"""
+    start_line = node.lineno - 1
+    end_line = node.end_lineno if hasattr(node, 'end_lineno') else start_line + 10
+    code_content = '\n'.join(lines[start_line:end_line])
+    
+    chunk_type = 'class' if isinstance(node, ast.ClassDef) else 'function'
+    
+    return CodeChunk(
+        file_path=file_path,
+        chunk_type=chunk_type,
+        name=node.name,
+        content=code_content,
+        line_start=node.lineno,
+        line_end=end_line,
+        docstring=ast.get_docstring(node) or ""
+    )
@@ -1,45 +1,120 @@
+import os
 import sqlite3
 import json
+import hashlib
+import time
+import threading
 from pathlib import Path
 from typing import List, Dict, Any
 from .scanner import CodeChunk
 
+# blake3 hashes chunk content several times faster than hashlib when installed
+try:
+    from blake3 import blake3 as _blake3
+except ImportError:
+    _blake3 = None
+
+# Lookup indexes on code_chunks, rebuilt after each bulk insert
+CHUNK_INDEXES = {
+    "idx_chunks_file": "code_chunks(file_path)",
+    "idx_chunks_type": "code_chunks(chunk_type)",
+    "idx_chunks_name": "code_chunks(name)",
+}
+
+def content_hash(text: str) -> bytes:
+    """Short fingerprint of chunk content, used to spot duplicated code"""
+    data = text.encode("utf-8")
+    if _blake3 is not None:
+        return _blake3(data).digest()[:16]
+    return hashlib.blake2b(data, digest_size=16).digest()
+
 class LocalStorage:
     def __init__(self, aibuddy_dir: Path):
         self.aibuddy_dir = aibuddy_dir
         self.db_path = aibuddy_dir / "data.db"
         self.config_path = aibuddy_dir / "config.json"
-        self.history_path = aibuddy_dir / "chat_history.json"
+        self.history_path = aibuddy_dir / "chat_history.jsonl"
+
+        # One connection per instance, shared by ask_batch worker threads
+        self._conn = None
+        self._conn_identity = None
+        self._lock = threading.Lock()
     
+    def _db_identity(self):
+        """Identify the database file, so a replaced file can be told apart"""
+        try:
+            st = os.stat(self.db_path)
+        except FileNotFoundError:
+            return None
+        return (st.st_dev, st.st_ino, st.st_ctime_ns)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the shared connection on first use, reopening it if the file was replaced"""
+        identity = self._db_identity()
+        if self._conn is not None and identity is not None and identity != self._conn_identity:
+            # 'ath init --force' deleted and recreated the database; the old
+            # handle would keep reading the unlinked file
+            self._conn.close()
+            self._conn = None
+        if self._conn is None:
+            # Autocommit; multi-statement writes use explicit transactions
+            conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            self._conn = conn
+            self._conn_identity = self._db_identity()
+        return self._conn
+
+    def close(self):
+        """Close the shared connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
     def init_db(self):
         """Initialize SQLite database"""
-        conn = sqlite3.connect(self.db_path)
-        
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS code_chunks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                file_path TEXT NOT NULL,
-                chunk_type TEXT NOT NULL,
-                name TEXT NOT NULL,
-                content TEXT NOT NULL,
-                line_start INTEGER,
-                line_end INTEGER,
-                docstring TEXT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS chat_history (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                question TEXT NOT NULL,
-                response TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
+        with self._lock:
+            conn = self._connect()
+
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS code_chunks (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    file_path TEXT NOT NULL,
+                    chunk_type TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    line_start INTEGER,
+                    line_end INTEGER,
+                    docstring TEXT,
+                    content_hash BLOB,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+
+            # Key/value facts about the stored data, such as the scan generation
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                )
+            ''')
+
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS chat_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    question TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+
+            for name, target in CHUNK_INDEXES.items():
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+            # WAL persists in the database file; readers no longer block the writer
+            conn.execute("PRAGMA journal_mode=WAL")
         
         config = {
             "version": "0.1.0",
@@ -54,56 +129,115 @@ class LocalStorage:
     
     def store_code_chunks(self, chunks: List[CodeChunk]):
         """Store code chunks in database"""
-        conn = sqlite3.connect(self.db_path)
-        
-        # Clear existing chunks
-        conn.execute("DELETE FROM code_chunks")
-        
-        # Insert new chunks
-        for chunk in chunks:
-            conn.execute('''
-                INSERT INTO code_chunks 
-                (file_path, chunk_type, name, content, line_start, line_end, docstring)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                chunk.file_path, chunk.chunk_type, chunk.name, 
-                chunk.content, chunk.line_start, chunk.line_end, chunk.docstring
-            ))
-        
-        conn.commit()
-        conn.close()
+        with self._lock:
+            conn = self._connect()
+            conn.execute("PRAGMA cache_size=-65536")  # 64 MB
+
+            # Replace all chunks in a single transaction. Building indexes once
+            # after the insert is cheaper than updating them row by row.
+            conn.execute("BEGIN")
+            try:
+                for name in CHUNK_INDEXES:
+                    conn.execute(f"DROP INDEX IF EXISTS {name}")
+                conn.execute("DELETE FROM code_chunks")
+                conn.executemany('''
+                    INSERT INTO code_chunks
+                    (file_path, chunk_type, name, content, line_start, line_end, docstring, content_hash)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    (c.file_path, c.chunk_type, c.name, c.content, c.line_start, c.line_end, c.docstring,
+                     content_hash(c.content))
+                    for c in chunks
+                ))
+                for name, target in CHUNK_INDEXES.items():
+                    conn.execute(f"CREATE INDEX {name} ON {target}")
+                # New on every store, even into a freshly recreated database
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('scan_generation', ?)",
+                    (str(time.time_ns()),)
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
     
     def get_all_chunks(self) -> List[Dict[str, Any]]:
         """Get all stored code chunks"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row  # Return rows as dicts
-        
-        cursor = conn.execute("SELECT * FROM code_chunks ORDER BY file_path, line_start")
-        chunks = [dict(row) for row in cursor.fetchall()]
-        
-        conn.close()
-        return chunks
+        with self._lock:
+            cursor = self._connect().execute("SELECT * FROM code_chunks ORDER BY file_path, line_start")
+            return [dict(row) for row in cursor.fetchall()]
     
+    def get_chunks_by_name(self, name: str) -> List[Dict[str, Any]]:
+        """Get code chunks with a given function, class or module name"""
+        with self._lock:
+            cursor = self._connect().execute(
+                "SELECT * FROM code_chunks WHERE name = ? ORDER BY file_path, line_start",
+                (name,)
+            )
+            return [dict(row) for row in cursor.fetchall()]
+
+    def get_chunk_columns(self) -> Dict[str, tuple]:
+        """Get chunk metadata, without content, as one tuple per column"""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT id, file_path, chunk_type, name, docstring FROM code_chunks ORDER BY file_path, line_start"
+            ).fetchall()
+
+        keys = ("id", "file_path", "chunk_type", "name", "docstring")
+        if not rows:
+            return {key: () for key in keys}
+        return dict(zip(keys, zip(*rows)))
+
+    def get_chunks_by_ids(self, ids: List[int]) -> List[Dict[str, Any]]:
+        """Get full code chunks by id, in the order given"""
+        if not ids:
+            return []
+        placeholders = ",".join("?" * len(ids))
+        with self._lock:
+            cursor = self._connect().execute(f"SELECT * FROM code_chunks WHERE id IN ({placeholders})", list(ids))
+            by_id = {row["id"]: dict(row) for row in cursor.fetchall()}
+        return [by_id[i] for i in ids if i in by_id]
+
+    def get_chunk_stats(self) -> Dict[str, int]:
+        """Count chunks, files and chunk types in SQL without loading rows"""
+        with self._lock:
+            conn = self._connect()
+            total, files = conn.execute("SELECT COUNT(*), COUNT(DISTINCT file_path) FROM code_chunks").fetchone()
+            by_type = {row[0]: row[1] for row in conn.execute("SELECT chunk_type, COUNT(*) FROM code_chunks GROUP BY chunk_type")}
+
+        return {
+            "total_chunks": total,
+            "files": files,
+            "functions": by_type.get("function", 0),
+            "classes": by_type.get("class", 0)
+        }
+
+    def version(self) -> str:
+        """Scan generation; changes whenever chunks are re-stored"""
+        with self._lock:
+            try:
+                row = self._connect().execute("SELECT value FROM meta WHERE key = 'scan_generation'").fetchone()
+            except sqlite3.OperationalError:
+                return ""  # Database from before the meta table existed
+        return row[0] if row else ""
+
     def get_chunks_by_file(self, file_path: str) -> List[Dict[str, Any]]:
         """Get code chunks for a specific file"""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        
-        cursor = conn.execute(
-            "SELECT * FROM code_chunks WHERE file_path = ? ORDER BY line_start", 
-            (file_path,)
-        )
-        chunks = [dict(row) for row in cursor.fetchall()]
-        
-        conn.close()
-        return chunks
+        with self._lock:
+            cursor = self._connect().execute(
+                "SELECT * FROM code_chunks WHERE file_path = ? ORDER BY line_start", 
+                (file_path,)
+            )
+            return [dict(row) for row in cursor.fetchall()]
     
     def save_chat(self, question: str, response: str):
         """Save chat interaction"""
-        conn = sqlite3.connect(self.db_path)
-        conn.execute(
-            "INSERT INTO chat_history (question, response) VALUES (?, ?)",
-            (question, response)
-        )
-        conn.commit()
-        conn.close()
\ No newline at end of file
+        with self._lock:
+            self._connect().execute(
+                "INSERT INTO chat_history (question, response) VALUES (?, ?)",
+                (question, response)
+            )
+
+    def open_chat_log(self):
+        """Open chat history for appending, one JSON line per turn"""
+        return open(self.history_path, "a", encoding="utf-8", buffering=1)
@@ -2,6 +2,46 @@ from pathlib import Path
 
 from pathlib import Path
 
+# Project indicators to look for (in order of preference)
+PROJECT_INDICATORS = (
+    '.aibuddy',      # Existing ath project
+    'setup.py',      # Python setuptools project
+    'pyproject.toml', # Modern Python project
+    '.git',          # Git repository
+    'requirements.txt', # Python dependencies
+    'Pipfile',       # Pipenv project
+    'poetry.lock',   # Poetry project
+)
+
+# Resolved start dir -> (project root, .aibuddy dir); only walks that found .aibuddy
+_walk_cache = {}
+
+def _walk_up(start_dir):
+    """
+    Walk up from start_dir once, finding both the nearest project root and
+    the nearest .aibuddy directory. Results are cached per process once a
+    .aibuddy is found, so a later 'init' in the same process is still seen.
+    """
+    start = (Path.cwd() if start_dir is None else Path(start_dir)).resolve()
+    cached = _walk_cache.get(start)
+    if cached is not None and cached[1].exists():
+        return cached
+
+    project_root = None
+    aibuddy_dir = None
+    current = start
+    while current != current.parent:  # Stop at filesystem root
+        if project_root is None and any((current / indicator).exists() for indicator in PROJECT_INDICATORS):
+            project_root = current
+        if (current / '.aibuddy').exists():
+            aibuddy_dir = current / '.aibuddy'
+            break
+        current = current.parent
+
+    if aibuddy_dir is not None:
+        _walk_cache[start] = (project_root, aibuddy_dir)
+    return project_root, aibuddy_dir
+
 def find_project_root(start_dir=None):
     """
     Find the project root directory by looking for project indicators.
@@ -9,58 +49,19 @@ def find_project_root(start_dir=None):
     
     Returns the directory containing project files, or current directory if not found.
     """
-    if start_dir is None:
-        start_dir = Path.cwd()
-    else:
-        start_dir = Path(start_dir)
-    
-    current = start_dir.resolve()
-    
-    # Project indicators to look for (in order of preference)
-    project_indicators = [
-        '.aibuddy',      # Existing ath project
-        'setup.py',      # Python setuptools project
-        'pyproject.toml', # Modern Python project
-        '.git',          # Git repository
-        'requirements.txt', # Python dependencies
-        'Pipfile',       # Pipenv project
-        'poetry.lock',   # Poetry project
-    ]
-    
-    # Walk up the directory tree
-    while current != current.parent:  # Stop at filesystem root
-        
-        # Check for any project indicators in current directory
-        for indicator in project_indicators:
-            if (current / indicator).exists():
-                return current
-        
-        # Move to parent directory
-        current = current.parent
-    
-    # If we reach here, no project root found - use the starting directory
-    return start_dir
+    project_root, _ = _walk_up(start_dir)
+    if project_root is None:
+        # No project root found - use the starting directory
+        return Path.cwd() if start_dir is None else Path(start_dir)
+    return project_root
 
 def find_aibuddy_dir(start_dir=None):
     """
     Find existing .aibuddy directory by searching upward.
     Returns None if not found.
     """
-    if start_dir is None:
-        start_dir = Path.cwd()
-    else:
-        start_dir = Path(start_dir)
-    
-    current = start_dir.resolve()
-    
-    # Walk up looking for .aibuddy
-    while current != current.parent:
-        aibuddy_path = current / '.aibuddy'
-        if aibuddy_path.exists():
-            return aibuddy_path
-        current = current.parent
-    
-    return None
+    _, aibuddy_dir = _walk_up(start_dir)
+    return aibuddy_dir
 
 # Usage examples:
 if __name__ == "__main__":
@@ -86,13 +87,5 @@ def get_project_stats(aibuddy_dir: Path) -> dict:
     from .storage import LocalStorage
     
     storage = LocalStorage(aibuddy_dir)
-    chunks = storage.get_all_chunks()
-    
-    stats = {
-        "total_chunks": len(chunks),
-        "files": len(set(chunk["file_path"] for chunk in chunks)),
-        "functions": len([c for c in chunks if c["chunk_type"] == "function"]),
-        "classes": len([c for c in chunks if c["chunk_type"] == "class"])
-    }
-    return stats
+    return storage.get_chunk_stats()
 
@@ -4,31 +4,44 @@ A random test Python file with various code patterns for testing purposes.
 Includes classes, functions, decorators, and different programming constructs.
 """
 
+import sys
 import json
+import logging
 import asyncio
 from datetime import datetime
 from typing import List, Dict, Optional
-from dataclasses import dataclass
-from functools import wraps
+from dataclasses import dataclass, field
+from functools import wraps, lru_cache
+from itertools import count, islice
+from contextlib import contextmanager
+
+# orjson parses several times faster; its JSONDecodeError subclasses json's
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
 
 # Global constant
 MAX_RETRIES = 3
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+# Slotted dataclasses drop the per-instance __dict__ (Python 3.10+)
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**DATACLASS_SLOTS)
 class User:
     """Simple user data class"""
     id: int
     name: str
     email: str
-    created_at: datetime = None
-    
-    def __post_init__(self):
-        if self.created_at is None:
-            self.created_at = datetime.now()
+    created_at: datetime = field(default_factory=datetime.now)
 
 def retry(max_attempts: int = 3):
     """Decorator to retry function calls"""
     def decorator(func):
+        if max_attempts == 1:
+            return func  # Nothing to retry, so skip the wrapper entirely
         @wraps(func)
         def wrapper(*args, **kwargs):
             for attempt in range(max_attempts):
@@ -37,7 +50,8 @@ def retry(max_attempts: int = 3):
                 except Exception as e:
                     if attempt == max_attempts - 1:
                         raise e
-                    print(f"Attempt {attempt + 1} failed: {e}")
+                    # Formatted only if debug logging is enabled
+                    logger.debug("Attempt %d failed: %s", attempt + 1, e)
             return None
         return wrapper
     return decorator
@@ -48,14 +62,15 @@ class DatabaseManager:
     def __init__(self, connection_string: str):
         self.connection_string = connection_string
         self.users: Dict[int, User] = {}
-        self._next_id = 1
+        self._ids = count(1)
     
     @retry(max_attempts=MAX_RETRIES)
     def create_user(self, name: str, email: str) -> User:
         """Create a new user with retry logic"""
-        user = User(id=self._next_id, name=name, email=email)
-        self.users[self._next_id] = user
-        self._next_id += 1
+        # Drawn in one step, so a failed attempt cannot leave the counter half-updated
+        user_id = next(self._ids)
+        user = User(id=user_id, name=name, email=email)
+        self.users[user_id] = user
         return user
     
     def get_user(self, user_id: int) -> Optional[User]:
@@ -64,33 +79,47 @@ class DatabaseManager:
     
     def list_users(self, limit: int = 10) -> List[User]:
         """Get list of users with pagination"""
-        return list(self.users.values())[:limit]
+        return list(islice(self.users.values(), limit))  # Stops after limit users
     
     async def async_operation(self, data: Dict) -> bool:
         """Simulate async database operation"""
         await asyncio.sleep(0.1)  # Simulate I/O delay
         return len(data) > 0
 
+def _parse_data(raw_data: str) -> tuple:
+    """Parse and transform raw JSON, raising on invalid input"""
+    if not isinstance(raw_data, (str, bytes, bytearray)):
+        # Checked here so orjson and json report non-text input the same way
+        raise TypeError(f"the JSON object must be str, bytes or bytearray, not {type(raw_data).__name__}")
+    data = json_loads(raw_data)
+    
+    # Data validation
+    if not isinstance(data, dict):
+        raise ValueError("Expected dictionary data")
+    
+    # Transform data
+    processed = {}
+    for key, value in data.items():
+        key = key.lower()
+        if type(value) is str:  # JSON strings are always exact str
+            processed[key] = value.strip()
+        elif isinstance(value, (int, float)):  # bool included, as before
+            processed[key] = value
+        else:
+            processed[key] = str(value)
+    
+    return tuple(processed.items())  # Immutable, so callers can't alter the cache
+
+# Only successful parses are cached: lru_cache does not store raised exceptions
+_parse_data_cached = lru_cache(maxsize=1024)(_parse_data)
+
 def process_data(raw_data: str) -> Dict:
     """Process raw JSON data with error handling"""
     try:
-        data = json.loads(raw_data)
-        
-        # Data validation
-        if not isinstance(data, dict):
-            raise ValueError("Expected dictionary data")
-        
-        # Transform data
-        processed = {}
-        for key, value in data.items():
-            if isinstance(value, str):
-                processed[key.lower()] = value.strip()
-            elif isinstance(value, (int, float)):
-                processed[key.lower()] = value
-            else:
-                processed[key.lower()] = str(value)
-        
-        return processed
+        if isinstance(raw_data, (str, bytes)):
+            return dict(_parse_data_cached(raw_data))
+        # bytearray is unhashable and anything else fails in parsing
+        return dict(_parse_data(raw_data))
         
     except json.JSONDecodeError as e:
         print(f"Invalid JSON: {e}")
@@ -99,6 +128,10 @@ def process_data(raw_data: str) -> Dict:
         print(f"Processing error: {e}")
         return {}
 
+def clear_process_data_cache():
+    """Forget previously parsed inputs"""
+    _parse_data_cached.cache_clear()
+
 # Generator function
 def fibonacci_generator(n: int):
     """Generate Fibonacci sequence up to n numbers"""
@@ -108,32 +141,24 @@ def fibonacci_generator(n: int):
         a, b = b, a + b
 
 # Context manager
-class FileProcessor:
+@contextmanager
+def FileProcessor(filename: str, mode: str = 'r'):
     """Context manager for file processing"""
-    
-    def __init__(self, filename: str, mode: str = 'r'):
-        self.filename = filename
-        self.mode = mode
-        self.file = None
-    
-    def __enter__(self):
-        self.file = open(self.filename, self.mode)
-        return self.file
-    
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.file:
-            self.file.close()
+    with open(filename, mode, buffering=1 << 20) as f:
+        yield f
 
 # Lambda functions and higher-order functions
 filter_even = lambda x: x % 2 == 0
-square = lambda x: x ** 2
+square = lambda x: x * x  # Multiply instead of the generic pow
 
 def apply_operations(numbers: List[int], operations: List) -> List[int]:
     """Apply a series of operations to numbers"""
-    result = numbers[:]
+    # Chain lazy maps so each number passes through every operation in one
+    # pass, building only the final list
+    result = numbers
     for operation in operations:
-        result = list(map(operation, result))
-    return result
+        result = map(operation, result)
+    return list(result)
 
 # Main execution
 if __name__ == "__main__":
@@ -1,23 +1,43 @@
+import os
+from pathlib import Path
+import numpy as np
+import sklearn
 from sklearn.datasets import load_digits
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score, classification_report
+from joblib import Memory
+from threadpoolctl import threadpool_limits
+
+# Fitted models are reused across runs while the training data is unchanged
+memory = Memory(str(Path(__file__).parent / ".cache_sklearn"), verbose=0)
+
+# Below this many matrix elements BLAS threads cost more in syncing than they save
+BLAS_SINGLE_THREAD_SIZE = 200_000
 
 # --- Functions ---
 
-def load_data():
+def load_data(dtype=np.float32):
+    # float32 halves the memory traffic through every BLAS call in the solver
     digits = load_digits()
-    return digits.data, digits.target
+    return digits.data.astype(dtype, copy=False), digits.target.astype(np.int32, copy=False)
 
 def split_data(X, y):
     return train_test_split(X, y, test_size=0.3, random_state=42)
 
-def train_model(X_train, y_train):
-    model = LogisticRegression(max_iter=1000)
-    model.fit(X_train, y_train)
+@memory.cache
+def train_model(X_train, y_train, sklearn_version=sklearn.__version__):
+    # sklearn_version is part of the cache key: pickled models break across releases
+    size = X_train.shape[0] * X_train.shape[1]
+    threads = 1 if size < BLAS_SINGLE_THREAD_SIZE else min(4, os.cpu_count() or 1)
+    with threadpool_limits(limits=threads, user_api="blas"):
+        model = LogisticRegression(solver="lbfgs", max_iter=1000)
+        model.fit(X_train, y_train)
     return model
 
 def evaluate_model(model, X_test, y_test):
+    # One batched predict over a C-contiguous matrix takes the BLAS fast path
+    X_test = np.ascontiguousarray(X_test)
     y_pred = model.predict(X_test)
     print("Accuracy:", accuracy_score(y_test, y_pred))
     print("Classification Report:\n", classification_report(y_test, y_pred))